@@ -5,25 +5,24 @@ fhi_aims_step
 A SEAMM plug-in for FHI-aims
 """
 
+import importlib
+
 # Bring up the classes so that they appear to be directly in
 # the fhi_aims_step package.
 
 from .fhi_aims import FHIaims  # noqa: F401, E501
 from .fhi_aims_parameters import FHIaimsParameters  # noqa: F401
 from .fhi_aims_step import FHIaimsStep  # noqa: F401, E501
-from .tk_fhi_aims import TkFHIaims  # noqa: F401, E501
 
 from .metadata import metadata  # noqa: F401
 
 from .energy_step import EnergyStep  # noqa: F401
 from .energy import Energy  # noqa: F401
 from .energy_parameters import EnergyParameters  # noqa: F401
-from .tk_energy import TkEnergy  # noqa: F401
 
 from .optimization_step import OptimizationStep  # noqa: F401
 from .optimization import Optimization  # noqa: F401
 from .optimization_parameters import OptimizationParameters  # noqa: F401
-from .tk_optimization import TkOptimization  # noqa: F401
 
 # Handle versioneer
 from ._version import get_versions
@@ -34,3 +33,18 @@ versions = get_versions()
 __version__ = versions["version"]
 __git_revision__ = versions["full-revisionid"]
 del get_versions, versions
+
+# The graphical classes are only imported when they are first used, so that running
+# without the GUI does not import Tk and the widgets.
+_tk_classes = {
+    "TkFHIaims": ".tk_fhi_aims",
+    "TkEnergy": ".tk_energy",
+    "TkOptimization": ".tk_optimization",
+}
+
+
+def __getattr__(name):
+    """Import the graphical classes the first time that they are used."""
+    if name in _tk_classes:
+        return getattr(importlib.import_module(_tk_classes[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""The results that FHI-aims produces, metadata["results"].
+
+The fields of each result are described in the developer guide
+(docs/developer_guide/metadata_schema.rst).
+"""
+
+# The calculations producing a result, shared by the entries below
+_ENERGY_OR_OPTIMIZATION = frozenset(("energy", "optimization"))
+_OPTIMIZATION = frozenset(("optimization",))
+
+# A number in the output, possibly in scientific notation
+_NUM = r"[-+eE0-9.]+"
+
+# Templates for the fields shared by several results
+_SCALAR_ENERGY = {
+    "calculation": _ENERGY_OR_OPTIMIZATION,
+    "dimensionality": "scalar",
+    "type": "float",
+    "units": "eV",
+}
+_SCALAR_FORCE = {
+    "calculation": _OPTIMIZATION,
+    "dimensionality": "scalar",
+    "type": "float",
+    "units": "eV/Å",
+}
+_FINAL_OUTPUT = {"dimensionality": "scalar", "json_section": "final_output"}
+_SCF_ITERATION = {
+    "dimensionality": "[n_iterations]",
+    "type": "float",
+    "json_section": "scf_iteration",
+}
+_MULLIKEN = {"type": "float", "json_section": "mulliken"}
+
+results = {
+    "energy": {
+        "description": "energy",
+        "dimensionality": "scalar",
+        "type": "float",
+        "units": "eV",
+    },
+    "gradients": {
+        "description": "gradients",
+        "dimensionality": [3, "n_atoms"],
+        "type": "float",
+        "units": "eV/Å",
+    },
+    "model": {
+        "description": "The model string",
+        "dimensionality": "scalar",
+        "type": "string",
+    },
+    "total_energy": _SCALAR_ENERGY
+    | {
+        "description": "The total energy",
+        "property": "total energy#FHIaims#{model}",
+        "json_section": "final_output",
+        "re": (
+            r"Total energy of the DFT / Hartree-Fock s.c.f. calculation      :"
+            rf" *({_NUM}) eV"
+        ),
+    },
+    "dispersion_energy": _SCALAR_ENERGY
+    | {
+        "description": "vdW energy correction",
+        "re": rf"Libmbd: Evaluated energy: *({_NUM})",
+    },
+    "total_number_of_loops": _FINAL_OUTPUT
+    | {
+        "calculation": _ENERGY_OR_OPTIMIZATION,
+        "description": "Number of SCF iterations",
+        "type": "integer",
+    },
+    "relaxation_step_number": _FINAL_OUTPUT
+    | {
+        "calculation": _OPTIMIZATION,
+        "description": "Number of geometry steps",
+        "type": "integer",
+    },
+    "maximum_force": _SCALAR_FORCE
+    | {
+        "description": "Maximum force",
+        "re": rf"Maximum force component is *({_NUM}) +eV/A",
+    },
+    "norm_force_atoms": _SCALAR_FORCE
+    | {
+        "description": "Norm of force on atoms",
+        "re": rf"\|\| Forces on atoms   \|\| = *({_NUM}) +eV/A",
+    },
+    "n_basis": _FINAL_OUTPUT
+    | {"description": "Number of basis fnctns", "type": "integer"},
+    "n_electrons": _FINAL_OUTPUT
+    | {"description": "Number of electrons", "type": "float"},
+    "n_spin": _FINAL_OUTPUT | {"description": "Number of spins", "type": "integer"},
+    "time_total": _FINAL_OUTPUT | {"description": "Total cpu time", "type": "float"},
+    "clock_time_total": _FINAL_OUTPUT
+    | {"description": "Total wallclock time", "type": "float"},
+    "total_energy^": _SCF_ITERATION
+    | {
+        "calculation": _ENERGY_OR_OPTIMIZATION,
+        "description": "SCF iteration energy",
+        "units": "eV",
+    },
+    "change_charge_density": _SCF_ITERATION
+    | {"description": "SCF final delta charge density"},
+    "change_spin_density": _SCF_ITERATION
+    | {"description": "SCF final delta spin density"},
+    "change_sum_eigenvalues": _SCF_ITERATION
+    | {"description": "SCF final delta eigenvalue sum"},
+    "change_forces": _SCF_ITERATION | {"description": "SCF final delta forces"},
+    "atoms_proj_charge": _MULLIKEN
+    | {"description": "Mulliken charges on atoms", "dimensionality": "[n_atoms]"},
+    "atoms_proj_spin": _MULLIKEN
+    | {"description": "Mulliken spins on atoms", "dimensionality": "[n_atoms]"},
+    "total_spin": _MULLIKEN | {"description": "Total spin", "dimensionality": "scalar"},
+}
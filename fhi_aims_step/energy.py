@@ -4,9 +4,10 @@
 """
 
 import csv
+import hashlib
+import io
 import logging
 from pathlib import Path
-import pkg_resources
 import pprint  # noqa: F401
 import textwrap
 
@@ -14,8 +15,8 @@ import numpy as np
 from tabulate import tabulate
 
 import fhi_aims_step
+from .fhi_aims import _register_properties
 from .substep import Substep
-import molsystem
 import seamm
 from seamm_util import ureg, Q_  # noqa: F401
 import seamm_util.printing as printing
@@ -33,11 +34,20 @@ logger = logging.getLogger(__name__)
 job = printing.getPrinter()
 printer = printing.getPrinter("FHI-aims")
 
-# Add this module's properties to the standard properties
-path = Path(pkg_resources.resource_filename(__name__, "data/"))
-csv_file = path / "properties.csv"
-if path.exists():
-    molsystem.add_properties_from_file(csv_file)
+# The rows of the summary table: label, key in the data, formatter, and units
+_SUMMARY_SCHEMA = (
+    ("Total energy", "total_energy", "{:.5f}".format, "eV"),
+    ("vdW correction", "dispersion_energy", "{:.5f}".format, "eV"),
+    ("Total Spin", "total_spin", "{:.5f}".format, " "),
+    ("Optimization steps", "relaxation_step_number", None, " "),
+    ("Force norm", "norm_force_atoms", None, "eV/Å"),
+    ("Maximum force", "maximum_force", None, "eV/Å"),
+    ("SCF steps", "total_number_of_loops", None, " "),
+    ("Δ charge density", "change_charge_density", lambda v: f"{v[-1]:.2e}", " "),
+    ("Δ spin density", "change_spin_density", lambda v: f"{v[-1]:.2e}", " "),
+    ("Δ Σ(eigenvalues)", "change_sum_eigenvalues", lambda v: f"{v[-1]:.2e}", " "),
+    ("Δ forces", "change_forces", lambda v: f"{v[-1]:.2e}", " "),
+)
 
 
 class Energy(Substep):
@@ -65,6 +75,26 @@ class Energy(Substep):
     Energy, EnergyParameters
     """
 
+    # Descriptions of the standard choices for relativity and dispersion
+    _relativity_text = {
+        "none": " Relativistic effects will not be included.",
+        "atomic ZORA approximation": (
+            " Relativistic effects will be included using the atomic ZORA "
+            "approximation."
+        ),
+    }
+    _dispersion_text = {
+        "none": " Long-range van der Waals terms will not be included.",
+        "nonlocal many-body dispersion (MBD-NL)": (
+            " Long-range van der Waals terms will be included using nonlocal "
+            "many-body dispersion (MBD-NL)."
+        ),
+        "range-separated self-consistently screened (MBD@rsSCS)": (
+            " Long-range van der Waals terms will be included using range-separated "
+            "self-consistently screened (MBD@rsSCS)."
+        ),
+    }
+
     def __init__(
         self,
         flowchart=None,
@@ -96,6 +126,8 @@ class Energy(Substep):
         """
         logger.debug(f"Creating Energy {self}")
 
+        _register_properties()
+
         super().__init__(
             flowchart=flowchart,
             title=title,
@@ -107,6 +139,8 @@ class Energy(Substep):
         self._calculation = "energy"
         self._model = None
         self._metadata = fhi_aims_step.metadata
+        self._parsed_cache = None
+        self._P = None
         self.parameters = fhi_aims_step.EnergyParameters()
 
     @property
@@ -137,106 +171,69 @@ class Energy(Substep):
         """
         options = self.parent.options
         directory = Path(self.directory)
+        indent4 = self.indent + 4 * " "
+        indent7 = self.indent + 7 * " "
 
         if P is None:
-            P = self.parameters.current_values_to_dict(
-                context=seamm.flowchart_variables._data
-            )
+            P = self._get_P()
 
         if len(data) == 0:
-            data = self.parse_data()
+            data = self._get_data()
 
-        text = ""
-        if type(self) is fhi_aims_step.Energy:
+        parts = []
+        if type(self) is Energy:
             # Check that the job ended successfully
             if "is_a_nice_day" in data and data["is_a_nice_day"]:
-                text += "The calculation finished successfully."
+                parts.append("The calculation finished successfully.")
                 # Write a small file to say that LAMMPS ran successfully, so cancel
                 # skip if rerunning.
-                path = Path(self.directory) / "success.dat"
+                path = directory / "success.dat"
                 path.write_text("success")
             else:
-                text += "The calculation did not complete properly! Be cautious.\n\n"
+                parts.append(
+                    "The calculation did not complete properly! Be cautious.\n\n"
+                )
 
-        if len(text) > 0:
+        if len(parts) > 0:
             printer.normal(
                 __(
-                    text,
-                    indent=self.indent + 4 * " ",
+                    "".join(parts),
+                    indent=indent4,
                     wrap=True,
                     dedent=False,
                 )
             )
-        text = ""
+        parts = []
 
         # Put any requested results into variables or tables
         self.store_results(configuration=configuration, data=data)
 
-        # Prepare our summary
-        table = {
-            "Item": [],
-            "Value": [],
-            "Units": [],
-        }
-        if "total_energy" in data:
-            table["Item"].append("Total energy")
-            table["Value"].append(f"{data['total_energy']:.5f}")
-            table["Units"].append("eV")
-        if "dispersion_energy" in data:
-            table["Item"].append("vdW correction")
-            table["Value"].append(f"{data['dispersion_energy']:.5f}")
-            table["Units"].append("eV")
-        if "total_spin" in data:
-            table["Item"].append("Total Spin")
-            table["Value"].append(f"{data['total_spin']:.5f}")
-            table["Units"].append(" ")
-        if "relaxation_step_number" in data:
-            table["Item"].append("Optimization steps")
-            table["Value"].append(data["relaxation_step_number"])
-            table["Units"].append(" ")
-        if "norm_force_atoms" in data:
-            table["Item"].append("Force norm")
-            table["Value"].append(data["norm_force_atoms"])
-            table["Units"].append("eV/Å")
-        if "maximum_force" in data:
-            table["Item"].append("Maximum force")
-            table["Value"].append(data["maximum_force"])
-            table["Units"].append("eV/Å")
-        if "total_number_of_loops" in data:
-            table["Item"].append("SCF steps")
-            table["Value"].append(data["total_number_of_loops"])
-            table["Units"].append(" ")
-        if "change_charge_density" in data:
-            table["Item"].append("Δ charge density")
-            table["Value"].append(f"{data['change_charge_density'][-1]:.2e}")
-            table["Units"].append(" ")
-        if "change_spin_density" in data:
-            table["Item"].append("Δ spin density")
-            table["Value"].append(f"{data['change_spin_density'][-1]:.2e}")
-            table["Units"].append(" ")
-        if "change_sum_eigenvalues" in data:
-            table["Item"].append("Δ Σ(eigenvalues)")
-            table["Value"].append(f"{data['change_sum_eigenvalues'][-1]:.2e}")
-            table["Units"].append(" ")
-        if "change_forces" in data:
-            table["Item"].append("Δ forces")
-            table["Value"].append(f"{data['change_forces'][-1]:.2e}")
-            table["Units"].append(" ")
-
-        tmp = tabulate(
-            table,
-            headers="keys",
-            tablefmt="psql",
-            colalign=("center", "decimal"),
-            disable_numparse=True,
-        )
-        length = len(tmp.splitlines()[0])
-        text_lines = []
-        text_lines.append("SCF Results".center(length))
-        text_lines.append(tmp)
-        tmp = "\n\n"
-        tmp += textwrap.indent("\n".join(text_lines), self.indent + 7 * " ")
-        printer.normal(tmp)
+        # Prepare our summary, if there is anything to summarize
+        rows = [
+            (label, data[key] if fmt is None else fmt(data[key]), units)
+            for label, key, fmt, units in _SUMMARY_SCHEMA
+            if key in data
+        ]
+        if len(rows) > 0:
+            items, values, units = zip(*rows)
+            table = {
+                "Item": list(items),
+                "Value": list(values),
+                "Units": list(units),
+            }
+
+            tmp = tabulate(
+                table,
+                headers="keys",
+                tablefmt="psql",
+                colalign=("center", "decimal"),
+                disable_numparse=True,
+            )
+            length = len(tmp.partition("\n")[0])
+            text_lines = ["SCF Results".center(length), tmp]
+            tmp = "\n\n"
+            tmp += textwrap.indent("\n".join(text_lines), indent7)
+            printer.normal(tmp)
 
         system, configuration = self.get_system_configuration(None)
         symbols = configuration.atoms.asymmetric_symbols
@@ -259,21 +256,22 @@ class Energy(Substep):
                 print(f"{symmetry=}, {symmetry.id=}")
                 chgs, delta = symmetry.symmetrize_atomic_scalar(chgs)
                 print(f"{chgs=}")
-                delta = np.array(delta)
-                max_delta = np.max(abs(delta))
-                text += (
+                delta = np.asarray(delta)
+                max_delta = np.abs(delta).max()
+                parts.append(
                     "The maximum difference of the charges of symmetry related atoms "
                     f"was {max_delta:.4f}\n"
                 )
             atoms["charge"][0:] = chgs
 
             # Print the charges and dump to a csv file
+            n_atoms = len(symbols)
             chg_tbl = {
-                "Atom": [*range(1, len(symbols) + 1)],
+                "Atom": [*range(1, n_atoms + 1)],
                 "Element": symbols,
-                "Charge": [],
             }
-            with open(directory / "atom_properties.csv", "w", newline="") as fd:
+            path = directory / "atom_properties.csv"
+            with open(path, "w", newline="", buffering=1 << 20) as fd:
                 writer = csv.writer(fd)
                 if "atoms_proj_spin" in data:
                     # Add to atoms (in coordinate table)
@@ -281,73 +279,58 @@ class Energy(Substep):
                         atoms.add_attribute(
                             "spin", coltype="float", configuration_dependent=True
                         )
-                        spins = data["atoms_proj_spin"][0]
-                        if symmetry.n_symops > 1:
-                            if P["primitive cell"]:
-                                spins = [spins[i] for i in self._mapping_to_primitive]
-                            spins, delta = symmetry.symmetrize_atomic_scalar(spins)
-                            atoms["spins"][0:] = spins
-                            delta = np.array(delta)
-                            max_delta = np.max(abs(delta))
-                            text += (
-                                " The maximum difference of the spins of symmetry "
-                                f"related atoms was {max_delta:.4f}.\n"
-                            )
-                        atoms["spin"][0:] = spins
+                    spins = data["atoms_proj_spin"][0]
+                    if symmetry.n_symops > 1:
+                        if P["primitive cell"]:
+                            spins = [spins[i] for i in self._mapping_to_primitive]
+                        spins, delta = symmetry.symmetrize_atomic_scalar(spins)
+                        delta = np.asarray(delta)
+                        max_delta = np.abs(delta).max()
+                        parts.append(
+                            " The maximum difference of the spins of symmetry "
+                            f"related atoms was {max_delta:.4f}.\n"
+                        )
+                    atoms["spin"][0:] = spins
 
                     header = "        Atomic charges and spins"
-                    chg_tbl["Spin"] = []
+                    chg_tbl["Charge"] = np.char.mod("%.3f", chgs).tolist()
+                    chg_tbl["Spin"] = np.char.mod("%.3f", spins).tolist()
                     writer.writerow(["Atom", "Element", "Charge", "Spin"])
-                    for atom, symbol, q, s in zip(
-                        range(1, len(symbols) + 1),
-                        symbols,
-                        chgs,
-                        spins,
-                    ):
-                        q = f"{q:.3f}"
-                        s = f"{s:.3f}"
-
-                        writer.writerow([atom, symbol, q, s])
-
-                        chg_tbl["Charge"].append(q)
-                        chg_tbl["Spin"].append(s)
+                    writer.writerows(
+                        zip(
+                            chg_tbl["Atom"],
+                            symbols,
+                            chg_tbl["Charge"],
+                            chg_tbl["Spin"],
+                        )
+                    )
                 else:
                     header = "        Atomic charges"
+                    chg_tbl["Charge"] = np.char.mod("%.2f", chgs).tolist()
                     writer.writerow(["Atom", "Element", "Charge"])
-                    for atom, symbol, q in zip(
-                        range(1, len(symbols) + 1),
-                        symbols,
-                        chgs,
-                    ):
-                        q = f"{q:.2f}"
-                        writer.writerow([atom, symbol, q])
-
-                        chg_tbl["Charge"].append(q)
-            if len(symbols) <= int(options["max_atoms_to_print"]):
+                    writer.writerows(zip(chg_tbl["Atom"], symbols, chg_tbl["Charge"]))
+            if n_atoms <= int(options["max_atoms_to_print"]):
                 tmp = tabulate(
                     chg_tbl,
                     headers="keys",
                     tablefmt="psql",
                     colalign=("center", "center"),
                 )
-                length = len(tmp.splitlines()[0])
-                text_lines = []
-                text_lines.append(header.center(length))
-                text_lines.append(tmp)
+                length = len(tmp.partition("\n")[0])
+                text_lines = [header.center(length), tmp]
                 tmp = "\n\n"
-                tmp += textwrap.indent("\n".join(text_lines), self.indent + 7 * " ")
+                tmp += textwrap.indent("\n".join(text_lines), indent7)
                 printer.normal(tmp)
 
-        if len(text) > 0:
+        if len(parts) > 0:
             printer.normal(
                 __(
-                    text,
-                    indent=self.indent + 4 * " ",
+                    "".join(parts),
+                    indent=indent4,
                     wrap=True,
                     dedent=False,
                 )
             )
-        text = []
 
         printer.normal("")
 
@@ -371,63 +354,75 @@ class Energy(Substep):
 
         model = P["model"]
         submodel = P["submodel"]
-        if type(self) is fhi_aims_step.Energy:
-            text = "A single point"
+        if type(self) is Energy:
+            parts = ["A single point"]
         else:
-            text = "Using an"
+            parts = ["Using an"]
         if self.is_expr(model):
             if self.is_expr(submodel):
-                text += (
+                parts.append(
                     " energy calculation with the model and submodel "
                     f"determined at runtime from '{model}' and '{submodel}.'"
                 )
         else:
             model = model[0].lower() + model[1:]
             if self.is_expr(submodel):
-                text += (
+                parts.append(
                     f" energy calculation with the {model} and "
                     f"submodel determined at runtime by '{submodel}.'"
                 )
             else:
-                text += (
+                parts.append(
                     f" energy calculation with the '{submodel}' variant "
                     f"of the {model}."
                 )
 
-        text += " The basis set version is "
+        parts.append(" The basis set version is ")
         basis = P["basis_version"]
         if self.is_expr(basis):
-            text += f"determined by the variable '{basis}'."
+            parts.append(f"determined by the variable '{basis}'.")
         else:
-            text += f"'{basis}'"
-            level = P[basis + "_level"]
-            if self.is_expr(level):
-                text += f". The level of the basis set will be determined by '{level}'."
+            parts.append(f"'{basis}'")
+            level_key = fhi_aims_step.EnergyParameters.BASIS_LEVEL_MAP.get(basis)
+            if level_key is None:
+                parts.append(".")
             else:
-                text += f", level '{level}'."
+                level = P[level_key]
+                if self.is_expr(level):
+                    parts.append(
+                        ". The level of the basis set will be determined by "
+                        f"'{level}'."
+                    )
+                else:
+                    parts.append(f", level '{level}'.")
 
         relativity = P["relativity"]
         if self.is_expr(relativity):
-            text += (
+            parts.append(
                 " Whether and how relativity will be included will be determined by "
                 f"'{relativity}'."
             )
-        elif relativity == "none":
-            text += " Relativistic effects will not be included."
         else:
-            text += f" Relativistic effects will be included using the {relativity}."
+            parts.append(
+                self._relativity_text.get(
+                    relativity,
+                    f" Relativistic effects will be included using the {relativity}.",
+                )
+            )
 
         dispersion = P["dispersion"]
         if self.is_expr(dispersion):
-            text += (
+            parts.append(
                 " Whether and how long-range van der Waals effects (many-body "
                 f"dispersion) will be included will be determined by '{dispersion}'."
             )
-        elif dispersion == "none":
-            text += " Long-range van der Waals terms will not be included."
         else:
-            text += (
-                f" Long-range van der Waals terms will be included using {dispersion}."
+            parts.append(
+                self._dispersion_text.get(
+                    dispersion,
+                    " Long-range van der Waals terms will be included using "
+                    f"{dispersion}.",
+                )
             )
 
         if configuration is not None and configuration.periodicity != 0:
@@ -435,46 +430,50 @@ class Energy(Substep):
             kmethod = P["k-grid method"]
             if kmethod == "grid spacing":
                 if isinstance(P["odd grid"], bool) or P["odd grid"] == "yes":
-                    text += (
+                    parts.append(
                         f" For periodic systems a {P['centering']} grid with a spacing "
                         f"of {P['k-spacing']} and odd numbers of points will be used."
                     )
                 else:
-                    text += (
+                    parts.append(
                         f" For periodic systems a {P['centering']} grid with a spacing "
                         f"of {P['k-spacing']} will be used."
                     )
             elif kmethod == "explicit grid dimensions":
-                text += (
+                parts.append(
                     f" For periodic systems a {P['na']} x{P['nb']} x{P['nc']} "
                     "grid will be used."
                 )
             broadening = P["occupation type"]
             if broadening in ("integer",):
-                text += " The occupation will be constrained to be integers."
+                parts.append(" The occupation will be constrained to be integers.")
             else:
-                text += (
+                parts.append(
                     " The effect of temperature on the electron distribution "
                     f"will be modeled using {P['occupation type']} broadening with a "
                     f"width of {P['smearing width']}."
                 )
         forces = P["calculate_gradients"]
         if not isinstance(forces, bool) and self.is_expr(forces):
-            text += (
+            parts.append(
                 " Whether forces will be calculated in this single-point calculation "
                 f"will be determined by '{forces}'."
             )
         if forces == "yes" or (isinstance(forces, bool) and forces):
-            text += " The forces will be calculated for this single-point calculation."
+            parts.append(
+                " The forces will be calculated for this single-point calculation."
+            )
 
         if (
             isinstance(P["input only"], bool)
             and P["input only"]
             or P["input only"] == "yes"
         ):
-            text += "\n\nThe input file will be written. No calculation will be run."
+            parts.append(
+                "\n\nThe input file will be written. No calculation will be run."
+            )
 
-        return self.header + "\n" + __(text, indent=4 * " ").__str__()
+        return self.header + "\n" + __("".join(parts), indent=4 * " ").__str__()
 
     def plot_control(self, P, configuration):
         """Create the density and orbital plots if requested
@@ -493,98 +492,6 @@ class Energy(Substep):
         if P["difference density"]:
             lines.append("output cube               delta_density")
 
-        # # and work out the orbitals
-        # txt = P["selected orbitals"]
-        # if txt == "all":
-        #     options["PlottedLevels"] = "1:-1"
-        # else:
-        #     orbitals = []
-        #     for chunk in txt.split(","):
-        #         chunk = chunk.strip()
-        #         if ":" in chunk or ".." in chunk:
-        #             if ":" in chunk:
-        #                 first, last = chunk.split(":")
-        #             elif ".." in chunk:
-        #                 first, last = chunk.split("..")
-        #             first = first.strip().upper()
-        #             last = last.strip().upper()
-
-        #             if first == "HOMO":
-        #                 first = homo
-        #             elif first == "LUMO":
-        #                 first = homo + 1
-        #             else:
-        #                 first = int(first.removeprefix("HOMO").removeprefix("LUMO"))
-        #                 if first < 0:
-        #                     first = homo + first
-        #                 else:
-        #                     first = homo + 1 + first
-
-        #             if last == "HOMO":
-        #                 last = homo
-        #             elif last == "LUMO":
-        #                 last = homo + 1
-        #             else:
-        #                 last = int(last.removeprefix("HOMO").removeprefix("LUMO"))
-        #                 if last < 0:
-        #                     last = homo + last
-        #                 else:
-        #                     last = homo + 1 + last
-
-        #             orbitals.extend(range(first, last + 1))
-        #         else:
-        #             first = chunk.strip().upper()
-
-        #             if first == "HOMO":
-        #                 first = homo
-        #             elif first == "LUMO":
-        #                 first = homo + 1
-        #             else:
-        #                 first = int(first.removeprefix("HOMO").removeprefix("LUMO"))
-        #                 if first < 0:
-        #                     first = homo + first
-        #                 else:
-        #                     first = homo + 1 + first
-        #             orbitals.append(first)
-
-        #         # Remove orbitals out of limits
-        #         tmp = orbitals
-        #         orbitals = []
-        #         for x in tmp:
-        #             if x > 0 and x <= n_orbitals:
-        #                 orbitals.append(x)
-
-        #         options["PlottedLevels"] = orbitals
-
-        # if periodicity != 0:
-        #     if P["selected k-points"] == "all":
-        #         options["PlottedKPoints"] = "1:-1"
-        #     else:
-        #         kpoints = []
-        #         for chunk in P["selected k-points"].split(","):
-        #             chunk = chunk.strip()
-        #             if ":" in chunk or ".." in chunk:
-        #                 if ":" in chunk:
-        #                     first, last = chunk.split(":")
-        #                 elif ".." in chunk:
-        #                     first, last = chunk.split("..")
-        #                 first = int(first.strip())
-        #                 last = int(last.strip())
-
-        #                 if first < 1:
-        #                     first = 1
-
-        #                 if last > last_kpoint:
-        #                     last = last_kpoint
-
-        #                 kpoints.extend(range(first, last + 1))
-        #             else:
-        #                 first = int(chunk.strip())
-        #                 if first > 0 and first <= last_kpoint:
-        #                     kpoints.append(first)
-        #         options["PlottedKPoints"] = kpoints
-
-        lines.append("")
         return lines
 
     def run(self, printer=printer, lines=None):
@@ -602,11 +509,12 @@ class Energy(Substep):
         if lines is None:
             lines = []
 
-        # Get the values of the parameters, dereferencing any variables
-        P = self.parameters.current_values_to_dict(
-            context=seamm.flowchart_variables._data
-        )
+        # Any results parsed previously are for an earlier calculation
+        self._parsed_cache = None
 
+        # Get the values of the parameters, dereferencing any variables. A subclass
+        # such as Optimization may already have them for this run.
+        P = self._get_P()
         _, configuration = self.get_system_configuration()
 
         # Set the attribute for writing just the input
@@ -623,12 +531,21 @@ class Energy(Substep):
         directory = Path(self.directory)
         directory.mkdir(parents=True, exist_ok=True)
 
+        atoms = configuration.atoms
+        periodicity = configuration.periodicity
+        dispersion = P["dispersion"]
+        fixed_spin_moment = P["fixed_spin_moment"]
+
         model = P["submodel"]
         if " : " in model:
             model = model.split(" : ")[0].strip()
-        lines.append("output                   json_log")
-        lines.append(f"xc                       {model}")
-        lines.append(f"charge                   {configuration.charge}")
+        lines.extend(
+            (
+                "output                   json_log",
+                f"xc                       {model}",
+                f"charge                   {configuration.charge}",
+            )
+        )
 
         # Handle spin
         multiplicity = configuration.spin_multiplicity
@@ -636,70 +553,58 @@ class Energy(Substep):
         if P["spin_polarization"] == "none":
             lines.append("spin                      none")
         else:
-            atoms = configuration.atoms
             have_spins = "spin" in atoms
             if have_spins:
-                for tmp in atoms["spin"]:
-                    if tmp is None:
-                        have_spins = False
-                        break
+                # Any missing spins (None) become NaN
+                spins = np.array(list(atoms["spin"]), dtype=float)
+                have_spins = not np.isnan(spins).any()
             if have_spins:
                 self.is_spin_polarized = True
                 lines.append("spin                     collinear")
-                if P["fixed_spin_moment"] == "yes":
-                    lines.append(f"fixed_spin_moment        {multiplicity-1}")
-                elif isinstance(P["fixed_spin_moment"], int):
-                    lines.append(f"fixed_spin_moment        {P['fixed_spin_moment']-1}")
+                line = self._fixed_spin_moment(fixed_spin_moment, multiplicity)
+                if line is not None:
+                    lines.append(line)
             else:
                 lines.append("spin                     none")
         lines.append("output                   Mulliken")
 
-        if P["relativity"] == "atomic ZORA approximation":
-            lines.append("relativistic             atomic_zora scalar")
-        else:
-            lines.append("relativistic             none")
+        lines.append(
+            "relativistic             atomic_zora scalar"
+            if P["relativity"] == "atomic ZORA approximation"
+            else "relativistic             none"
+        )
         if P["calculate_gradients"]:
             lines.append("compute_forces           .true.")
-        if "MBD-NL" in P["dispersion"]:
+        if "MBD-NL" in dispersion:
             lines.append("many_body_dispersion_nl")
-        elif "MBD@rsSCS" in P["dispersion"]:
+        elif "MBD@rsSCS" in dispersion:
             lines.append("many_body_dispersion")
 
-        if configuration.periodicity != 0:
+        if periodicity != 0:
             if "explicit" in P["k-grid method"]:
                 lines.append(f"k_grid                   {P['na']} {P['nb']} {P['nc']}")
             else:
-                lengths = configuration.cell.reciprocal_lengths()
+                lengths = np.asarray(configuration.cell.reciprocal_lengths())
                 spacing = P["k-spacing"].to("1/Å").magnitude
-                na = round(lengths[0] / spacing)
-                nb = round(lengths[0] / spacing)
-                nc = round(lengths[0] / spacing)
-                na = na if na > 0 else 1
-                nb = nb if nb > 0 else 1
-                nc = nc if nc > 0 else 1
+                n_k = np.maximum(1, np.rint(lengths / spacing).astype(int))
                 if P["odd grid"]:
-                    na = na + 1 if na % 2 == 0 else na
-                    nb = nb + 1 if nb % 2 == 0 else nb
-                    nc = nc + 1 if nc % 2 == 0 else nc
-
-                lines.append(f"k_grid                   {P['na']} {P['nb']} {P['nc']}")
-
-                if P["centering"] == "𝚪-centered":
-                    oa = 0.0 if na % 2 == 1 else 1 / (2 * na)
-                    ob = 0.0 if nb % 2 == 1 else 1 / (2 * nb)
-                    oc = 0.0 if nc % 2 == 1 else 1 / (2 * nc)
-                elif P["centering"] == "off center":
-                    oa = 0.0 if na % 2 == 0 else 1 / (2 * na)
-                    ob = 0.0 if nb % 2 == 0 else 1 / (2 * nb)
-                    oc = 0.0 if nc % 2 == 0 else 1 / (2 * nc)
-                elif P["centering"] == "Monkhorst-Pack":
-                    oa = 0.0 if na % 2 == 1 else 0.5 - 1 / (2 * na)
-                    ob = 0.0 if nb % 2 == 1 else 0.5 - 1 / (2 * nb)
-                    oc = 0.0 if nc % 2 == 1 else 0.5 - 1 / (2 * nc)
+                    n_k = np.where(n_k % 2 == 0, n_k + 1, n_k)
+                na, nb, nc = n_k.tolist()
+
+                lines.append(f"k_grid                   {na} {nb} {nc}")
+
+                centering = P["centering"]
+                if centering == "𝚪-centered":
+                    offsets = np.where(n_k % 2 == 1, 0.0, 1 / (2 * n_k))
+                elif centering == "off-center":
+                    offsets = np.where(n_k % 2 == 0, 0.0, 1 / (2 * n_k))
+                elif centering == "Monkhorst-Pack":
+                    offsets = np.where(n_k % 2 == 1, 0.0, 0.5 - 1 / (2 * n_k))
                 else:
                     raise RuntimeError(
-                        f"Don't recognize k-space grid centering {P['centering']}"
+                        f"Don't recognize k-space grid centering {centering}"
                     )
+                oa, ob, oc = offsets.tolist()
                 lines.append(f"k_offset                 {oa:8.6f} {ob:8.6f} {oc:8.6f}")
 
                 lines.append(
@@ -710,22 +615,141 @@ class Energy(Substep):
         # Any plotting we need to do (orbitals, density, ...)
         lines.extend(self.plot_control(P, configuration))
 
-        data = "\n".join(lines)
-        data += self._basis_sets(
-            P, configuration.atoms.symbols, configuration.atoms.atomic_numbers
-        )
+        # Write the keywords and then the basis sets into a single buffer
+        control = io.StringIO()
+        control.write("\n".join(lines))
+        control.write("\n")
+        control.write(self._basis_sets(P, atoms.symbols, atoms.atomic_numbers))
 
         files = {
-            "control.in": data,
+            "control.in": control.getvalue(),
             "geometry.in": self._geometry(configuration),
         }
 
-        return_files = ["aims.out", "geometry.in.next_step", "*.cube", "*.json"]
-        self.run_aims(files, return_files)
+        # Reuse an earlier, successful calculation with identical input
+        inputs_hash = hashlib.blake2b(
+            "".join(files.values()).encode(), digest_size=16
+        ).hexdigest()
+        reuse = not self.input_only and self._can_reuse(directory, inputs_hash)
+
+        if reuse:
+            printer.normal(
+                self.indent
+                + 4 * " "
+                + "Using the results of an earlier run with identical input."
+            )
+        else:
+            return_files = ["aims.out", "geometry.in.next_step", "*.cube", "*.json"]
+            self.run_aims(files, return_files)
 
         if not self.input_only:
             self.analyze(P=P, configuration=configuration)
 
-            path = directory / "success.dat"
-            if not path.exists():
-                path.write_text("success")
+            data = self._get_data()
+            self._record_run(directory, inputs_hash, data.get("is_a_nice_day", False))
+
+    @staticmethod
+    def _can_reuse(directory, inputs_hash):
+        """Whether an earlier, successful run in the directory had identical input.
+
+        If it cannot be reused, any success.dat is removed so that FHI-aims is run.
+
+        Parameters
+        ----------
+        directory : pathlib.Path
+            The directory of the calculation.
+        inputs_hash : str
+            The hash of the input files for this calculation.
+
+        Returns
+        -------
+        bool
+            True if the earlier results can be used.
+        """
+        success_path = directory / "success.dat"
+        hash_path = directory / "inputs.hash"
+        if (
+            success_path.exists()
+            and hash_path.exists()
+            and hash_path.read_text() == inputs_hash
+        ):
+            return True
+        success_path.unlink(missing_ok=True)
+        return False
+
+    @staticmethod
+    def _record_run(directory, inputs_hash, success):
+        """Record the outcome of a run, so that a successful one can be reused.
+
+        Parameters
+        ----------
+        directory : pathlib.Path
+            The directory of the calculation.
+        inputs_hash : str
+            The hash of the input files for this calculation.
+        success : bool
+            Whether the calculation finished successfully.
+        """
+        success_path = directory / "success.dat"
+        hash_path = directory / "inputs.hash"
+        if success:
+            if not success_path.exists():
+                success_path.write_text("success")
+            hash_path.write_text(inputs_hash)
+        else:
+            success_path.unlink(missing_ok=True)
+            hash_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _fixed_spin_moment(value, multiplicity):
+        """The fixed_spin_moment line for control.in, if the moment is fixed.
+
+        Parameters
+        ----------
+        value : str, int or float
+            "yes" to fix the moment from the multiplicity of the configuration, or
+            the multiplicity to fix it to. Anything else does not fix the moment.
+        multiplicity : int
+            The spin multiplicity of the configuration.
+
+        Returns
+        -------
+        str or None
+            The line for control.in, or None if the moment is not fixed.
+        """
+        if value == "yes":
+            return f"fixed_spin_moment        {multiplicity-1}"
+        elif isinstance(value, (int, float)):
+            return f"fixed_spin_moment        {int(value)-1}"
+        return None
+
+    def _get_P(self):
+        """The current values of the parameters, dereferencing any variables.
+
+        While a subclass such as Optimization is running, the values it kept in
+        self._P are reused, so that they are only calculated once.
+
+        Returns
+        -------
+        dict
+            The values of the parameters.
+        """
+        if self._P is not None:
+            return self._P
+        return self.parameters.current_values_to_dict(
+            context=seamm.flowchart_variables._data
+        )
+
+    def _get_data(self):
+        """Get the parsed results, reusing them if aims.out has not changed.
+
+        Returns
+        -------
+        dict
+            The results parsed from the output of FHI-aims.
+        """
+        stat = (Path(self.directory) / "aims.out").stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._parsed_cache is None or self._parsed_cache[0] != key:
+            self._parsed_cache = (key, self.parse_data())
+        return self._parsed_cache[1]
@@ -4,12 +4,33 @@ Control parameters for the Energy step in a SEAMM flowchart
 """
 
 import logging
+from types import MappingProxyType
+
 import seamm
 import pprint  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
 
+def _freeze(schema):
+    """Return a read-only view of a parameter schema.
+
+    The definitions themselves stay dictionaries, because seamm.Parameter only
+    accepts dictionaries.
+
+    Parameters
+    ----------
+    schema : {str: {str: any}}
+        The definitions of the parameters.
+
+    Returns
+    -------
+    MappingProxyType
+        A read-only mapping of the definitions.
+    """
+    return MappingProxyType(schema)
+
+
 class EnergyParameters(seamm.Parameters):  # noqa: E999
     """
     The control parameters for Energy.
@@ -504,6 +525,31 @@ class EnergyParameters(seamm.Parameters):  # noqa: E999
         },
     }
 
+    # The parameter that gives the level for each version of the basis sets
+    # that has levels.
+    BASIS_LEVEL_MAP = MappingProxyType(
+        {
+            "defaults_2010": "defaults_2010_level",
+            "defaults_2020": "defaults_2020_level",
+            "NAO-VCC-nZ": "NAO-VCC-nZ_level",
+            "NAO-J-n": "NAO-J-n_level",
+        }
+    )
+
+    # The schemas are shared by all instances, so make them read-only
+    parameters = _freeze(parameters)
+    energy_parameters = _freeze(energy_parameters)
+    kspace_parameters = _freeze(kspace_parameters)
+    output_parameters = _freeze(output_parameters)
+
+    # All the parameters above, merged once rather than for every instance
+    _merged_defaults = {
+        **parameters,
+        **energy_parameters,
+        **kspace_parameters,
+        **output_parameters,
+    }
+
     def __init__(self, defaults={}, data=None):
         """
         Initialize the parameters, by default with the parameters defined above
@@ -524,13 +570,9 @@ class EnergyParameters(seamm.Parameters):  # noqa: E999
 
         logger.debug("EnergyParameters.__init__")
 
-        super().__init__(
-            defaults={
-                **EnergyParameters.parameters,
-                **EnergyParameters.energy_parameters,
-                **EnergyParameters.kspace_parameters,
-                **EnergyParameters.output_parameters,
-                **defaults,
-            },
-            data=data,
-        )
+        if len(defaults) == 0:
+            merged = self._merged_defaults
+        else:
+            merged = {**self._merged_defaults, **defaults}
+
+        super().__init__(defaults=merged, data=data)
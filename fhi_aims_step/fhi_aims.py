@@ -3,16 +3,14 @@
 """Non-graphical part of the FHI-aims step in a SEAMM flowchart
 """
 
+import functools
+import importlib.resources
 import logging
 from pathlib import Path
-import pkg_resources
-import pprint  # noqa: F401
-import sys
 
 import fhi_aims_step
-import molsystem
 import seamm
-from seamm_util import ureg, Q_, getParser  # noqa: F401
+from seamm_util import getParser
 import seamm_util.printing as printing
 from seamm_util.printing import FormattedText as __
 
@@ -28,11 +26,85 @@ logger = logging.getLogger(__name__)
 job = printing.getPrinter()
 printer = printing.getPrinter("FHI-aims")
 
-# Add this module's properties to the standard properties
-path = Path(pkg_resources.resource_filename(__name__, "data/"))
-csv_file = path / "properties.csv"
-if path.exists():
-    molsystem.add_properties_from_file(csv_file)
+# The FHI-aims specific command-line / config file options
+_ARGS = (
+    (
+        "--max-atoms-to-print",
+        {
+            "type": int,
+            "default": 25,
+            "help": "Maximum number of atoms to print charges, etc.",
+        },
+    ),
+    (
+        "--ncores",
+        {
+            "default": "available",
+            "help": (
+                "The maximum number of cores to use for FHI-aims. "
+                "Default: all available cores."
+            ),
+        },
+    ),
+    (
+        "--atoms-per-core",
+        {
+            "type": int,
+            "default": 1,
+            "help": "the optimal number of atoms per core for FHI-aims",
+        },
+    ),
+    (
+        "--html",
+        {
+            "action": "store_true",
+            "help": "whether to write out html files for graphs, etc.",
+        },
+    ),
+    (
+        "--modules",
+        {
+            "nargs": "*",
+            "default": None,
+            "help": "the environment modules to load for FHI-aims",
+        },
+    ),
+    (
+        "--path",
+        {"default": None, "help": "the path to the FHI-aims executables"},
+    ),
+    (
+        "--basis-path",
+        {"default": None, "help": "the path to the basis sets"},
+    ),
+    (
+        "--aims",
+        {"default": "aims.x", "help": "the executable for FHI-aims"},
+    ),
+    (
+        "--mpiexec",
+        {"default": "mpiexec", "help": "the mpi executable"},
+    ),
+)
+
+
+def _data_dir():
+    """The directory holding the data files for this package."""
+    return Path(importlib.resources.files("fhi_aims_step")) / "data"
+
+
+@functools.cache
+def _register_properties():
+    """Add this module's properties to the standard properties.
+
+    This is done once, the first time a FHI-aims step is created, rather than
+    when the module is imported.
+    """
+    import molsystem
+
+    csv_file = _data_dir() / "properties.csv"
+    if csv_file.is_file():
+        molsystem.add_properties_from_file(csv_file)
 
 
 class FHIaims(seamm.Node):
@@ -92,6 +164,9 @@ class FHIaims(seamm.Node):
         None
         """
         logger.debug(f"Creating FHI-aims {self}")
+
+        _register_properties()
+
         self.subflowchart = seamm.Flowchart(
             parent=self, name="FHI-aims", namespace=namespace
         )
@@ -105,6 +180,11 @@ class FHIaims(seamm.Node):
         )
         self.parameters = fhi_aims_step.FHIaimsParameters()
 
+        # The substeps in order, captured when the ids are set
+        self._ordered_nodes = None
+        # The references that the FHI-aims citation was last added to
+        self._cited_in = None
+
         self._metadata = fhi_aims_step.metadata
 
     @property
@@ -128,19 +208,17 @@ class FHIaims(seamm.Node):
         indent: str
             An extra indentation for the output
         """
-        # Get the first real node
-        node = self.subflowchart.get_node("1").next()
+        important = printer.important
 
         # Loop over the subnodes, asking them to do their analysis
-        while node is not None:
-            for value in node.description:
-                printer.important(value)
-                printer.important(" ")
+        for node in self._subnodes():
+            if node.description:
+                for value in node.description:
+                    important(value)
+                    important(" ")
 
             node.analyze()
 
-            node = node.next()
-
     def create_parser(self):
         """Setup the command-line / config file parser"""
         parser_name = self.step_type
@@ -157,64 +235,8 @@ class FHIaims(seamm.Node):
             return result
 
         # FHI-aims specific options
-
-        parser.add_argument(
-            parser_name,
-            "--max-atoms-to-print",
-            default=25,
-            help="Maximum number of atoms to print charges, etc.",
-        )
-
-        parser.add_argument(
-            parser_name,
-            "--ncores",
-            default="available",
-            help=(
-                "The maximum number of cores to use for FHI-aims. "
-                "Default: all available cores."
-            ),
-        )
-        parser.add_argument(
-            parser_name,
-            "--atoms-per-core",
-            type=int,
-            default="1",
-            help="the optimal number of atoms per core for FHI-aims",
-        )
-        parser.add_argument(
-            parser_name,
-            "--html",
-            action="store_true",
-            help="whether to write out html files for graphs, etc.",
-        )
-        parser.add_argument(
-            parser_name,
-            "--modules",
-            nargs="*",
-            default=None,
-            help="the environment modules to load for FHI-aims",
-        )
-        parser.add_argument(
-            parser_name,
-            "--path",
-            default=None,
-            help="the path to the FHI-aims executables",
-        )
-        parser.add_argument(
-            parser_name,
-            "--basis-path",
-            default=None,
-            help="the path to the basis sets",
-        )
-        parser.add_argument(
-            parser_name,
-            "--aims",
-            default="aims.x",
-            help="the executable for FHI-aims",
-        )
-        parser.add_argument(
-            parser_name, "--mpiexec", default="mpiexec", help="the mpi executable"
-        )
+        for flag, kwargs in _ARGS:
+            parser.add_argument(parser_name, flag, **kwargs)
 
         return result
 
@@ -233,33 +255,21 @@ class FHIaims(seamm.Node):
         str
             A description of the current step.
         """
-        self.subflowchart.root_directory = self.flowchart.root_directory
+        root_directory = self.flowchart.root_directory
+        if self.subflowchart.root_directory != root_directory:
+            self.subflowchart.root_directory = root_directory
 
-        # Get the first real node
-        node = self.subflowchart.get_node("1").next()
-
-        text = self.header + "\n\n"
-        while node is not None:
+        # The subflowchart may have been edited since the ids were set, so walk it.
+        parts = [self.header, "\n\n"]
+        for node in self._walk_subflowchart():
             try:
-                text += __(node.description_text(), indent=3 * " ").__str__()
+                description = node.description_text()
             except Exception as e:
-                print(f"Error describing fhi_aims flowchart: {e} in {node}")
                 logger.critical(f"Error describing fhi_aims flowchart: {e} in {node}")
                 raise
-            except:  # noqa: E722
-                print(
-                    "Unexpected error describing fhi_aims flowchart: "
-                    f"{sys.exc_info()[0]} in {str(node)}"
-                )
-                logger.critical(
-                    "Unexpected error describing fhi_aims flowchart: "
-                    f"{sys.exc_info()[0]} in {str(node)}"
-                )
-                raise
-            text += "\n"
-            node = node.next()
-
-        return text
+            parts.append(str(__(description, indent=3 * " ")))
+            parts.append("\n")
+        return "".join(parts)
 
     def run(self):
         """Run a FHI-aims step.
@@ -279,23 +289,21 @@ class FHIaims(seamm.Node):
         printer.important(self.header)
         printer.important("")
 
-        # Add the main citation for FHI-aims
-        self.references.cite(
-            raw=self._bibliography["BLUM20092175"],
-            alias="FHI-aims",
-            module="FHI-aims step",
-            level=1,
-            note="The principle citation for FHI-aims.",
-        )
-
-        # Get the first real node
-        node = self.subflowchart.get_node("1").next()
-
-        # And loop
-        while node is not None:
+        # Add the main citation for FHI-aims, once if the step is run repeatedly
+        references = self.references
+        if references is not self._cited_in:
+            references.cite(
+                raw=self._bibliography["BLUM20092175"],
+                alias="FHI-aims",
+                module="FHI-aims step",
+                level=1,
+                note="The principle citation for FHI-aims.",
+            )
+            self._cited_in = references
+
+        for node in self._subnodes():
             if node.is_runable:
                 node.run()
-            node = node.next()
 
         # Add other citations here or in the appropriate place in the code.
         # Add the bibtex to data/references.bib, and add a self.reference.cite
@@ -310,4 +318,35 @@ class FHIaims(seamm.Node):
         # and set our subnodes
         self.subflowchart.set_ids(self._id)
 
+        # Capture the substeps for run() and analyze(), which follow this
+        self._ordered_nodes = self._walk_subflowchart()
+
         return self.next()
+
+    def _subnodes(self):
+        """The substeps in the subflowchart, in order.
+
+        Returns
+        -------
+        [seamm.Node]
+            The list captured by set_id, or the current substeps if the ids have
+            not been set yet.
+        """
+        if self._ordered_nodes is None:
+            return self._walk_subflowchart()
+        return self._ordered_nodes
+
+    def _walk_subflowchart(self):
+        """Walk the subflowchart, returning the substeps in order.
+
+        Returns
+        -------
+        [seamm.Node]
+            The nodes following the start node of the subflowchart.
+        """
+        nodes = []
+        node = self.subflowchart.get_node("1").next()
+        while node is not None:
+            nodes.append(node)
+            node = node.next()
+        return nodes
@@ -5,7 +5,6 @@ Control parameters for the FHIaims step in a SEAMM flowchart
 
 import logging
 import seamm
-import pprint  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
@@ -95,13 +94,13 @@ class FHIaimsParameters(seamm.Parameters):  # noqa: E999
         # },
     }
 
-    def __init__(self, defaults={}, data=None):
+    def __init__(self, defaults=None, data=None):
         """
         Initialize the parameters, by default with the parameters defined above
 
         Parameters
         ----------
-        defaults: dict
+        defaults: dict = None
             A dictionary of parameters to initialize. The parameters
             above are used first and any given will override/add to them.
         data: dict
@@ -115,6 +114,9 @@ class FHIaimsParameters(seamm.Parameters):  # noqa: E999
 
         logger.debug("FHIaimsParameters.__init__")
 
-        super().__init__(
-            defaults={**FHIaimsParameters.parameters, **defaults}, data=data
-        )
+        if not defaults:
+            merged = FHIaimsParameters.parameters
+        else:
+            merged = {**FHIaimsParameters.parameters, **defaults}
+
+        super().__init__(defaults=merged, data=data)
@@ -3,15 +3,16 @@
 """Non-graphical part of the Optimization step in a FHI aims flowchart
 """
 
+import hashlib
 import logging
+import mmap
+import os
 from pathlib import Path
-import pkg_resources
 import pprint  # noqa: F401
-import traceback
+import re
 
 import fhi_aims_step  # noqa: E999
-import molsystem
-import seamm
+import numpy as np
 from seamm_util import ureg, Q_  # noqa: F401
 import seamm_util.printing as printing
 from seamm_util.printing import FormattedText as __
@@ -28,11 +29,100 @@ logger = logging.getLogger(__name__)
 job = printing.getPrinter()
 printer = printing.getPrinter("FHI aims")
 
-# Add this module's properties to the standard properties
-path = Path(pkg_resources.resource_filename(__name__, "data/"))
-csv_file = path / "properties.csv"
-if path.exists():
-    molsystem.add_properties_from_file(csv_file)
+# The atoms and lattice vectors in geometry.in.next_step, matched in the raw bytes
+_GEOMETRY_LINE = re.compile(
+    rb"^[ \t]*(atom|atom_frac|lattice_vector)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)",
+    re.MULTILINE,
+)
+
+
+def _read_geometry(path):
+    """Read the coordinates and lattice vectors from a FHI-aims geometry file.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The geometry file, e.g. geometry.in.next_step
+
+    Returns
+    -------
+    str, numpy.ndarray, numpy.ndarray
+        The type of coordinates, "Cartesian" or "fractional" (None if there are no
+        atoms), the coordinates [n_atoms, 3], and the lattice vectors [n, 3].
+    """
+    # The file is mapped rather than read, so that it is neither copied nor decoded
+    with open(path, "rb") as fd:
+        if os.fstat(fd.fileno()).st_size == 0:
+            matches = []
+        else:
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                matches = _GEOMETRY_LINE.findall(mm)
+    tags = [m[0] for m in matches]
+    values = np.array([m[1:] for m in matches], dtype=np.float64).reshape(-1, 3)
+
+    is_lattice = np.array([tag == b"lattice_vector" for tag in tags], dtype=bool)
+    xyz = values[~is_lattice]
+    lattice_vectors = values[is_lattice]
+
+    if b"atom_frac" in tags:
+        coordinate_type = "fractional"
+    elif xyz.shape[0] > 0:
+        coordinate_type = "Cartesian"
+    else:
+        coordinate_type = None
+    return coordinate_type, xyz, lattice_vectors
+
+
+# The buffer for writing the structure files, large enough for most in one write
+_WRITE_BUFFER = 1 << 20
+
+
+def _write_file(path, text):
+    """Write a text file through a large buffer.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The file to write.
+    text : str
+        The contents of the file.
+    """
+    with open(path, "w", buffering=_WRITE_BUFFER, encoding="utf-8") as fd:
+        fd.write(text)
+
+
+def _write_structure(path, producer, digest=None):
+    """Write a structure file, logging any error creating or writing it.
+
+    If a digest of the structure is given it is kept next to the file, e.g. in
+    optimized.cif.hash, and the file is not created again while the digest matches.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The file to write.
+    producer : callable
+        A function returning the text of the file, e.g. configuration.to_cif_text
+    digest : str = None
+        A digest of the structure, or None to always write the file.
+    """
+    hash_path = path.with_name(path.name + ".hash")
+    if (
+        digest is not None
+        and path.exists()
+        and hash_path.exists()
+        and hash_path.read_text() == digest
+    ):
+        return
+    # The digest is only written once the file has been, so a failed or interrupted
+    # write never leaves a matching digest next to a bad file.
+    try:
+        hash_path.unlink(missing_ok=True)
+        _write_file(path, producer())
+        if digest is not None:
+            _write_file(hash_path, digest)
+    except Exception:
+        logger.warning(f"Error creating {path.name}", exc_info=True)
 
 
 class Optimization(fhi_aims_step.Energy):
@@ -60,6 +150,17 @@ class Optimization(fhi_aims_step.Energy):
     Optimization, OptimizationParameters
     """
 
+    # Descriptions of the standard choices for the configuration name
+    _configuration_name_text = {
+        "use SMILES string": "using SMILES as its name.",
+        "use Canonical SMILES string": "using canonical SMILES as its name.",
+        "keep current name": "keeping the current name.",
+        "optimized with {model}": "with 'optimized with <model>' as its name.",
+        "use configuration number": (
+            "using the index of the configuration (1, 2, ...) as its name."
+        ),
+    }
+
     def __init__(
         self,
         flowchart=None,
@@ -145,15 +246,18 @@ class Optimization(fhi_aims_step.Energy):
             f"{P['force_convergence']}."
         )
         if configuration is not None and configuration.periodicity != 0:
-            if P["optimize_cell"] == "yes":
+            optimize_cell = P["optimize_cell"]
+            if optimize_cell == "yes":
                 text += " For periodic systems, the unit cell will also be optimized."
-            elif "angle" in P["optimize_cell"]:
+            elif optimize_cell == "fixing the angles":
                 text += (
                     " For periodic systems, the unit cell will also be optimized, but "
                     "cell angles will be fixed."
                 )
-            if P["pressure"] != 0.0:
-                text += f" An external pressure of {P['pressure']} will be applied."
+            # Compare the magnitude, which avoids pint's comparison of quantities
+            pressure = P["pressure"]
+            if getattr(pressure, "magnitude", pressure) != 0.0:
+                text += f" An external pressure of {pressure} will be applied."
 
         if not (
             isinstance(P["input only"], bool)
@@ -163,16 +267,8 @@ class Optimization(fhi_aims_step.Energy):
             text += f" The optimized structure will {P['structure handling']} "
 
             confname = P["configuration name"]
-            if confname == "use SMILES string":
-                text += "using SMILES as its name."
-            elif confname == "use Canonical SMILES string":
-                text += "using canonical SMILES as its name."
-            elif confname == "keep current name":
-                text += "keeping the current name."
-            elif confname == "optimized with {model}":
-                text += "with 'optimized with <model>' as its name."
-            elif confname == "use configuration number":
-                text += "using the index of the configuration (1, 2, ...) as its name."
+            if confname in self._configuration_name_text:
+                text += self._configuration_name_text[confname]
             else:
                 confname = confname.replace("{model}", "<model>")
                 text += f"with '{confname}' as its name."
@@ -200,13 +296,9 @@ class Optimization(fhi_aims_step.Energy):
         if lines is None:
             lines = []
 
-        # Get the values of the parameters, dereferencing any variables
-        P = self.parameters.current_values_to_dict(
-            context=seamm.flowchart_variables._data
-        )
-
-        directory = Path(self.directory)
-        directory.mkdir(parents=True, exist_ok=True)
+        # Get the values of the parameters, dereferencing any variables. They are
+        # kept for Energy.run, which is called below.
+        P = self._P = self._get_P()
 
         # Get the current system and configuration (ignoring the system...)
         _, configuration = self.get_system_configuration(None)
@@ -218,15 +310,19 @@ class Optimization(fhi_aims_step.Energy):
         lines.append(f"relax_geometry           bfgs {convergence:.4f}")
 
         if configuration.periodicity != 0:
-            if P["optimize_cell"] == "yes":
+            optimize_cell = P["optimize_cell"]
+            if optimize_cell == "yes":
                 lines.append("relax_unit_cell          full")
-            elif "angle" in P["optimize_cell"]:
+            elif optimize_cell == "fixing the angles":
                 lines.append("relax_unit_cell          fixed_angles")
 
             if P["pressure"].magnitude != 0.0:
                 lines.append(f"external_pressure        {P['pressure'].m_as('eV/Å^3')}")
 
-        super().run(printer=printer, lines=lines)
+        try:
+            super().run(printer=printer, lines=lines)
+        finally:
+            self._P = None
 
         # Add other citations here or in the appropriate place in the code.
         # Add the bibtex to data/references.bib, and add a self.reference.cite
@@ -243,49 +339,30 @@ class Optimization(fhi_aims_step.Energy):
         indent: str
             An extra indentation for the output
         """
+        directory = Path(self.directory)
+
         # Get the parameters used
         if P is None:
-            P = self.parameters.current_values_to_dict(
-                context=seamm.flowchart_variables._data
-            )
+            P = self._get_P()
 
         if len(data) == 0:
-            data = self.parse_data()
+            data = self._get_data()
 
         # Check that the job ended successfully
         if "is_a_nice_day" in data and data["is_a_nice_day"]:
             text = "The optimization finished successfully."
             # Write a small file to say that LAMMPS ran successfully, so cancel
             # skip if rerunning.
-            path = Path(self.directory) / "success.dat"
+            path = directory / "success.dat"
             path.write_text("success")
         else:
             text = "The optimization did not complete properly! Be cautious.\n\n"
 
-        path = Path(self.directory) / "geometry.in.next_step"
+        path = directory / "geometry.in.next_step"
         coordinate_type = None
+        digest = None
         if path.exists():
-            lines = path.read_text().splitlines()
-            xyz = []
-            lattice_vectors = []
-            for line in lines:
-                line = line.strip()
-                if len(line) == 0:
-                    continue
-                if line[0] == "#":
-                    continue
-                tmp = line.split()
-                if tmp[0] == "atom":
-                    coordinate_type = "Cartesian"
-                    x, y, z = tmp[1:4]
-                    xyz.append([float(x), float(y), float(z)])
-                elif tmp[0] == "atom_frac":
-                    coordinate_type = "fractional"
-                    x, y, z = tmp[1:4]
-                    xyz.append([float(x), float(y), float(z)])
-                elif tmp[0] == "lattice_vector":
-                    x, y, z = tmp[1:4]
-                    lattice_vectors.append([float(x), float(y), float(z)])
+            coordinate_type, xyz, lattice_vectors = _read_geometry(path)
 
             # Follow instructions for where to put the coordinates,
             _, starting_configuration = self.get_system_configuration(None)
@@ -348,25 +425,30 @@ class Optimization(fhi_aims_step.Energy):
                 P=P, same_as="current", model=self.model
             )
 
-        # Write the structure out for viewing.
-        directory = Path(self.directory)
-        directory.mkdir(parents=True, exist_ok=True)
-
-        #  MMCIF file has bonds
-        try:
-            path = directory / "optimized.mmcif"
-            path.write_text(configuration.to_mmcif_text())
-        except Exception:
-            message = "Error creating the mmcif file\n\n" + traceback.format_exc()
-            logger.warning(message)
-        # CIF file has cell
+        # Write the structure out for viewing. The directory exists, since the output
+        # was read from it. The files are only recreated if the optimized structure
+        # has changed, e.g. not when the results of an earlier run are reused.
+        if coordinate_type is not None:
+            digest = hashlib.blake2b(
+                b"".join(
+                    (
+                        xyz.tobytes(),
+                        lattice_vectors.tobytes(),
+                        np.asarray(configuration.atoms.atomic_numbers).tobytes(),
+                        configuration.name.encode(),
+                    )
+                ),
+                digest_size=16,
+            ).hexdigest()
+
+        #  MMCIF file has bonds, and the CIF file has the cell
+        _write_structure(
+            directory / "optimized.mmcif", configuration.to_mmcif_text, digest
+        )
         if configuration.periodicity == 3:
-            try:
-                path = directory / "optimized.cif"
-                path.write_text(configuration.to_cif_text())
-            except Exception:
-                message = "Error creating the cif file\n\n" + traceback.format_exc()
-                logger.warning(message)
+            _write_structure(
+                directory / "optimized.cif", configuration.to_cif_text, digest
+            )
 
         printer.normal(
             __(
@@ -104,6 +104,17 @@ class OptimizationParameters(fhi_aims_step.EnergyParameters):
         },
     }
 
+    # The parameters of an energy calculation plus those above, merged once and shared
+    # by all instances. Each entry is copied to a plain dict, as Parameter requires.
+    _merged_defaults = {
+        key: dict(entry)
+        for key, entry in {
+            **fhi_aims_step.EnergyParameters._merged_defaults,
+            **parameters,
+            **seamm.standard_parameters.structure_handling_parameters,
+        }.items()
+    }
+
     def __init__(self, defaults={}, data=None):
         """
         Initialize the parameters, by default with the parameters defined above
@@ -124,20 +135,9 @@ class OptimizationParameters(fhi_aims_step.EnergyParameters):
 
         logger.debug("OptimizationParameters.__init__")
 
-        super().__init__(
-            defaults={
-                **OptimizationParameters.parameters,
-                **seamm.standard_parameters.structure_handling_parameters,
-                **defaults,
-            },
-            data=data,
-        )
+        super().__init__(defaults=defaults, data=data)
 
         # Do any local editing of defaults
-        tmp = self["configuration name"]
-        tmp._data["enumeration"] = ["optimized with {model}", *tmp.enumeration[1:]]
-        tmp.default = "keep current name"
-
         tmp = self["configuration name"]
         tmp._data["enumeration"] = ["optimized with {model}", *tmp.enumeration]
         tmp.default = "optimized with {model}"
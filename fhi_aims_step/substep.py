@@ -4,20 +4,28 @@
 """
 
 import configparser
+import functools
 import importlib
 import json
 import logging
 from pathlib import Path
-import pprint
 import re
 import shutil
 
+import fhi_aims_step
+from .metadata import result_specs, results_for, results_pattern
 from molsystem.elements import to_symbols
+import numpy as np
 import seamm
 import seamm_exec
 from seamm_util import Q_, Configuration
 import seamm_util.printing as printing
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # In addition to the normal logger, two logger-like printing facilities are
 # defined: 'job' and 'printer'. 'job' send output to the main job.out file for
 # the job, and should be used very sparingly, typically to echo what this step
@@ -30,6 +38,82 @@ logger = logging.getLogger(__name__)
 job = printing.getPrinter()
 printer = printing.getPrinter("FHI-aims")
 
+# The Python types for the "type" of results in the metadata
+_TYPES = {"float": float, "integer": int, "string": str}
+
+# A block of forces in aims.out, the lines starting with "|" after the title
+_FORCES = re.compile(r"Total atomic forces.*\n((?:[ \t]*\|.*\n)+)")
+
+# The fhi-aims.ini files read, as {path: ((mtime, size), ConfigParser)}
+_ini_cache = {}
+
+
+def _read_ini(path):
+    """Read a fhi-aims.ini file, reusing the result while the file is unchanged.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The ini file.
+
+    Returns
+    -------
+    configparser.ConfigParser
+        The contents of the file, which are empty if it does not exist. The parser
+        is shared, so should not be changed.
+    """
+    if not path.exists():
+        return configparser.ConfigParser()
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    if path not in _ini_cache or _ini_cache[path][0] != key:
+        config = configparser.ConfigParser()
+        config.read(path)
+        _ini_cache[path] = (key, config)
+    return _ini_cache[path][1]
+
+
+@functools.lru_cache(maxsize=512)
+def _read_basis_file(path):
+    """The text of a basis set file, which is read from disk only once.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The basis set file, e.g. .../light/06_C_default
+
+    Returns
+    -------
+    str
+        The contents of the file.
+    """
+    return path.read_text()
+
+
+def _json_records(path):
+    """The records in the JSON output of FHI-aims, one at a time.
+
+    With ijson installed the file is streamed, so only one record is in memory at a
+    time; otherwise it is read with the json module.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The JSON file written by FHI-aims.
+
+    Yields
+    ------
+    dict
+        Each record in the file. There are none if the file does not exist.
+    """
+    if not path.exists():
+        return
+    with path.open("rb") as fd:
+        if ijson is None:
+            yield from json.load(fd)
+        else:
+            yield from ijson.items(fd, "item", use_float=True)
+
 
 class Substep(seamm.Node):
     """A base class for substeps in the FHI-aims step."""
@@ -157,19 +241,18 @@ class Substep(seamm.Node):
 
         # Read configuration file for FHI-aims
         executor_type = executor.name
-        full_config = configparser.ConfigParser()
         ini_dir = Path(seamm_options["root"]).expanduser()
         path = ini_dir / "fhi-aims.ini"
 
         # If the config file doesn't exists, get the default
         if not path.exists():
-            resources = importlib.resources.files("fhi-aims_step") / "data"
+            resources = importlib.resources.files("fhi_aims_step") / "data"
             ini_text = (resources / "fhi-aims.ini").read_text()
             txt_config = Configuration(path)
             txt_config.from_string(ini_text)
             txt_config.save()
 
-        full_config.read(ini_dir / "fhi-aims.ini")
+        full_config = _read_ini(ini_dir / "fhi-aims.ini")
 
         # Getting desperate! Look for an executable in the path
         if executor_type not in full_config:
@@ -189,7 +272,7 @@ class Substep(seamm.Node):
                 if path is not None:
                     txt_config.set_value(executor_type, "mpiexec", str(path))
                 txt_config.save()
-                full_config.read(ini_dir / "fhi-aims.ini")
+                full_config = _read_ini(ini_dir / "fhi-aims.ini")
 
         config = dict(full_config.items(executor_type))
 
@@ -209,7 +292,10 @@ class Substep(seamm.Node):
             self.logger.error("There was an error running FHI-aims")
             return None
 
-        logger.debug("\n" + pprint.pformat(result))
+        if logger.isEnabledFor(logging.DEBUG):
+            import pprint
+
+            logger.debug("\n" + pprint.pformat(result))
 
         return result
 
@@ -235,8 +321,7 @@ class Substep(seamm.Node):
 
         # Read configuration file for FHI-aims
         ini_dir = Path(self.global_options["root"]).expanduser()
-        full_config = configparser.ConfigParser()
-        full_config.read(ini_dir / "fhi-aims.ini")
+        full_config = _read_ini(ini_dir / "fhi-aims.ini")
         executor_type = executor.name
         if executor_type not in full_config:
             raise RuntimeError(
@@ -246,7 +331,7 @@ class Substep(seamm.Node):
         config = dict(full_config.items(executor_type))
 
         basis = P["basis_version"]
-        level = P[basis + "_level"]
+        level = P[fhi_aims_step.EnergyParameters.BASIS_LEVEL_MAP[basis]]
         basis_path = Path(config["basis-path"]) / basis / level
 
         # The model chemistry
@@ -258,11 +343,9 @@ class Substep(seamm.Node):
         filename = {
             atno: f"{atno:02}_{symbol}_default" for atno, symbol in zip(atnos, symbols)
         }
-        result = ""
-        for atno in sorted(filename.keys()):
-            path = basis_path / filename[atno]
-            result += path.read_text()
-        return result
+        return "".join(
+            _read_basis_file(basis_path / filename[atno]) for atno in sorted(filename)
+        )
 
     def _geometry(self, configuration):
         """Get the geometry for FHI-aims.
@@ -344,23 +427,21 @@ class Substep(seamm.Node):
         none
         """
         data = {}
+        directory = Path(self.directory)
 
         # Parsing values from the JSON
-        path = Path(self.directory) / "aims.json"
-        if path.exists():
-            with path.open() as fd:
-                jdata = json.load(fd)
-        for section in jdata:
+        path = directory / "aims.json"
+        specs = result_specs()
+        results = {key: specs[key] for key, _ in results_for(self.calculation)}
+        by_section = self._metadata["results_by_section"]
+        section = {}
+        for section in _json_records(path):
             record = section["record_type"]
-            for key, mdata in self._metadata["results"].items():
+            for key in by_section.get(record, ()):
                 self.logger.debug(f"results {key=}")
-                if (
-                    "calculation" in mdata
-                    and self.calculation not in mdata["calculation"]
-                ):
-                    continue
-                if "json_section" not in mdata or mdata["json_section"] != record:
+                if key not in results:
                     continue
+                mdata = results[key]
 
                 tmp_key = key.rstrip("^")
                 if tmp_key in section:
@@ -373,12 +454,11 @@ class Substep(seamm.Node):
                             else 27.2113845
                         )
                         value = value / aimsEh2eV * Q_(1, "E_h").m_as("eV")
-                    if "type" in mdata:
-                        if isinstance(value, list):
-                            value = [mdata["type"](v) for v in value]
-                        else:
-                            value = mdata["type"](value)
-                    if mdata["dimensionality"] == "scalar":
+                    if isinstance(value, list):
+                        value = [_TYPES[mdata.type](v) for v in value]
+                    else:
+                        value = _TYPES[mdata.type](value)
+                    if mdata.dimensionality == "scalar":
                         data[key] = value
                     else:
                         if key not in data:
@@ -393,7 +473,7 @@ class Substep(seamm.Node):
         data["model"] = "FHI-aims/" + self.model
 
         # Parsing values from the output
-        path = Path(self.directory) / "aims.out"
+        path = directory / "aims.out"
         output = path.read_text()
 
         # Find the citations and other data
@@ -429,41 +509,36 @@ class Substep(seamm.Node):
         # |    1   0.116396923435835E+00   0.380404354092886E-01  -0.486778273969592E-27
         # |    2   0.177234658278163E+00  -0.618817461451795E-01  -0.649037698626122E-27
         # |    3  -0.293631581713999E+00   0.238413107358909E-01  -0.649037698626122E-27
-
-        it = iter(lines)
-        for line in it:
-            if "Total atomic forces" in line:
-                forces = []
-                for line in it:
-                    line = line.strip()
-                    if len(line) == 0:
-                        break
-                    parts = line.split()
-                    forces.append([-float(p) for p in parts[2:]])
-                data["gradients"] = forces
-
-        for key, mdata in self._metadata["results"].items():
+        #
+        # The forces are printed for each step of an optimization, so the last block
+        # is the final one. Each line has "|", the atom number and the force.
+        blocks = _FORCES.findall(output)
+        if len(blocks) > 0:
+            values = np.array(blocks[-1].replace("|", " ").split(), dtype=float)
+            data["gradients"] = (-values.reshape(-1, 4)[:, 1:]).tolist()
+
+        # Scan the output once for the results found with regular expressions,
+        # keeping the last value of each
+        pattern, groups = results_pattern()
+        matches = {}
+        for match in pattern.finditer(output):
+            key, group = groups[match.lastgroup]
+            matches[key] = match.group(group)
+
+        for key, mdata in results.items():
             self.logger.debug(f"results {key=}")
             if key in data:
                 continue
-            if "calculation" in mdata and self.calculation not in mdata["calculation"]:
-                continue
-            if "re" not in mdata:
+            if mdata.re is None:
                 continue
 
-            self.logger.debug(mdata["re"])
-            matches = re.findall(mdata["re"], output)
-            self.logger.debug(matches)
-            if len(matches) > 0:
-                txt = matches[-1]
+            self.logger.debug(mdata.re)
+            if key in matches:
+                txt = matches[key]
+                self.logger.debug(txt)
                 if txt == "":
-                    self.logger.warning(
-                        f"Parsing output, re ({mdata['re']}) gave error"
-                    )
+                    self.logger.warning(f"Parsing output, re ({mdata.re}) gave error")
                 else:
-                    if "type" in mdata:
-                        data[key] = mdata["type"](txt)
-                    else:
-                        data[key] = txt
+                    data[key] = _TYPES[mdata.type](txt)
 
         return data
@@ -429,8 +429,8 @@ class TkEnergy(seamm.TkNode):
         keys.append("basis_version")
 
         basis_version = self["basis_version"].get()
-        key = basis_version + "_level"
-        if key in P:
+        key = fhi_aims_step.EnergyParameters.BASIS_LEVEL_MAP.get(basis_version)
+        if key is not None:
             keys.append(key)
         else:
             tk.messagebox.showwarning(
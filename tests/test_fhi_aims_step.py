@@ -11,3 +11,74 @@ def test_construction():
     """Just create an object and test its type."""
     result = fhi_aims_step.FHIaims()
     assert str(type(result)) == "<class 'fhi_aims_step.fhi_aims.FHIaims'>"
+
+
+def test_energy_construction():
+    """Create an Energy substep, which builds its parameters."""
+    result = fhi_aims_step.Energy()
+    assert str(type(result)) == "<class 'fhi_aims_step.energy.Energy'>"
+    assert "submodel" in result.parameters
+
+
+def test_optimization_construction():
+    """Create an Optimization substep, which builds its parameters."""
+    result = fhi_aims_step.Optimization()
+    assert str(type(result)) == "<class 'fhi_aims_step.optimization.Optimization'>"
+    assert "force_convergence" in result.parameters
+    assert "submodel" in result.parameters
+
+
+def test_optimization_parameters():
+    """Create the Optimization parameters directly, including the merged ones."""
+    result = fhi_aims_step.OptimizationParameters()
+    assert "force_convergence" in result
+    assert "submodel" in result
+    assert result["configuration name"].default == "optimized with {model}"
+
+
+def test_fixed_spin_moment():
+    """Check the fixed spin moment from the multiplicity or an explicit value."""
+    line = fhi_aims_step.Energy._fixed_spin_moment
+    assert line("yes", 3) == "fixed_spin_moment        2"
+    assert line(2, 1) == "fixed_spin_moment        1"
+    assert line(4.0, 1) == "fixed_spin_moment        3"
+    assert line("no", 3) is None
+
+
+def test_reuse_successful_run(tmp_path):
+    """A successful run is reused only while the input is identical."""
+    energy = fhi_aims_step.Energy
+    assert not energy._can_reuse(tmp_path, "abc")
+    energy._record_run(tmp_path, "abc", True)
+    assert energy._can_reuse(tmp_path, "abc")
+    assert not energy._can_reuse(tmp_path, "def")
+    # The changed input removes success.dat, so FHI-aims is run again
+    assert not (tmp_path / "success.dat").exists()
+
+
+def test_run_without_input_hash_is_not_reused(tmp_path):
+    """A run from before the input was hashed is not reused."""
+    (tmp_path / "success.dat").write_text("success")
+    assert not fhi_aims_step.Energy._can_reuse(tmp_path, "abc")
+    assert not (tmp_path / "success.dat").exists()
+
+
+def test_failed_run_is_not_reused(tmp_path):
+    """A failed run removes the record of any earlier successful one."""
+    energy = fhi_aims_step.Energy
+    energy._record_run(tmp_path, "abc", True)
+    energy._record_run(tmp_path, "abc", False)
+    assert not (tmp_path / "inputs.hash").exists()
+    assert not energy._can_reuse(tmp_path, "abc")
+
+
+def test_result_specs():
+    """Every result, and the optional fields in the schema, fit in a ResultSpec."""
+    from fhi_aims_step.metadata import ResultSpec, result_specs
+
+    specs = result_specs()
+    assert specs["total_energy"].units == "eV"
+    spec = ResultSpec(
+        description="A result", dimensionality="scalar", type="float", methods=["dft"]
+    )
+    assert spec.methods == ["dft"]